@@ -657,8 +657,11 @@ file_action_dict = {
 	int(VssRevisionAction.CreateFile) : file_create_action,
 }
 
+file_action_table = make_action_table(file_action_dict)
+
 def create_file_action(revision:vss_revision, base_path):
-	action_class = file_action_dict.get(revision.action, None)
+	action = revision.action
+	action_class = file_action_table[action] if action < len(file_action_table) else None
 	if action_class is not None:
 		return action_class(revision, base_path)
 	raise UnrecognizedRevActionException("Unrecognized file revision action", str(revision.action))
@@ -686,8 +689,11 @@ project_action_dict = {
 	int(VssRevisionAction.RecoverFile) : recover_file_action,
 }
 
+project_action_table = make_action_table(project_action_dict)
+
 def create_project_action(revision:vss_revision, base_path):
-	action_class = project_action_dict.get(revision.action, None)
+	action = revision.action
+	action_class = project_action_table[action] if action < len(project_action_table) else None
 	if action_class is not None:
 		return action_class(revision, base_path)
 	raise UnrecognizedRevActionException("Unrecognized project revision action", str(revision.action))
@@ -13,7 +13,7 @@
 #   limitations under the License.
 
 from __future__ import annotations
-from typing import DefaultDict, List, Tuple
+from typing import List, Tuple
 import re
 
 from .vss_record import timestamp_to_datetime, indent_string
@@ -13,12 +13,12 @@
 #   limitations under the License.
 
 from __future__ import annotations
-from typing import DefaultDict
-
 from .vss_exception import VssFileNotFoundException
 from .vss_verbose import VerboseFlags
 
+import os
 import re
+import mmap
 from pathlib import Path
 
 class simple_ini_parser:
@@ -46,12 +46,18 @@ class vss_database:
 	ProjectSeparator = "/"
 
 	# Default encoding is the local Windows ANSI code page
-	def __init__(self, path:str, encoding='mbcs', root_project_file=None):
+	# Files smaller than this are always read, even with use_mmap
+	MMAP_THRESHOLD = 0x10000
+
+	def __init__(self, path:str, encoding='mbcs', root_project_file=None, use_mmap=False):
 		self.base_path:str = path
 		self.encoding = encoding
+		self.use_mmap = use_mmap
 		self.index_name_dict = {}
 		self.physical_name_dict = {}
-		self.logical_name_dict = {}
+		self.decoded_string_dict = {}
+		self.long_name_dict = {}
+		self.full_name_dict = {}
 
 		if root_project_file is not None:
 			self.RootProjectFile = root_project_file
@@ -63,7 +69,9 @@ class vss_database:
 		data_path = ini_reader.get("Data_Path", "data")
 		self.data_path = Path(path, data_path)
 
-		self.record_files_by_physical:DefaultDict[str,vss_record_file] = {}
+		self.record_files_by_physical:dict[str,vss_record_file] = {}
+		# Built by get_project_tree()
+		self.project_tree = None
 
 		# In-method imports are used to prevent circular dependencies
 		from .vss_name_file import vss_name_file
@@ -74,10 +82,13 @@ class vss_database:
 	def open_root_project(self, project_class, recursive=False):
 		return project_class(self, self.RootProjectFile, self.RootProjectName, 0, recursive=recursive)
 
+	# The tree is built once, and then returned for all following calls
 	def get_project_tree(self):
-		# In-method imports are used to prevent circular dependencies
-		from .vss_item import vss_project
-		return self.open_root_project(vss_project, recursive=True)
+		if self.project_tree is None:
+			# In-method imports are used to prevent circular dependencies
+			from .vss_item import vss_project
+			self.project_tree = self.open_root_project(vss_project, recursive=True)
+		return self.project_tree
 
 	def get_data_path(self, physical_name, first_letter_subdirectory=True):
 		if first_letter_subdirectory:
@@ -87,13 +98,54 @@ class vss_database:
 		else:
 			return Path(self.data_path, physical_name)
 
+	# Data files are read whole with a single read() call, and then parsed from memory.
+	# An unbuffered file object is returned, because the Python buffer layer
+	# would only add an extra copy to a single read of the whole file.
 	def open_data_file(self, physical_name, first_letter_subdirectory=True):
 		try:
 			return open(self.get_data_path(physical_name,
-					first_letter_subdirectory=first_letter_subdirectory), 'rb')
+					first_letter_subdirectory=first_letter_subdirectory), 'rb', buffering=0)
 		except FileNotFoundError as fnf:
 			raise VssFileNotFoundException("VSS: %s %s" % (fnf.strerror, fnf.filename))
 
+	# Returns the whole file data, as 'bytes' or a read-only mmap.
+	# With use_mmap, big files are mapped, instead of copying them to a bytes object.
+	# Note that Python's mmap keeps a duplicate file descriptor open for each mapping,
+	# which is why only files above MMAP_THRESHOLD are mapped.
+	def read_data_file(self, physical_name, first_letter_subdirectory=True):
+		with self.open_data_file(physical_name, first_letter_subdirectory) as file:
+			if self.use_mmap:
+				size = os.fstat(file.fileno()).st_size
+				if size >= self.MMAP_THRESHOLD:
+					data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+					# The records are parsed front to back
+					if hasattr(mmap, 'MADV_SEQUENTIAL'):
+						data.madvise(mmap.MADV_SEQUENTIAL)
+					return data
+			return file.read()
+
+	# Ask the OS to start reading all data files in the background, in directory order.
+	# This is only a hint; it does nothing where os.posix_fadvise is not available.
+	# Can be run in a separate thread, while the files are parsed
+	def prefetch_data_files(self):
+		if not hasattr(os, 'posix_fadvise'):
+			return
+		for dirpath, dirnames, filenames in os.walk(self.data_path):
+			for filename in filenames:
+				try:
+					fd = os.open(os.path.join(dirpath, filename), os.O_RDONLY)
+				except OSError:
+					continue
+				try:
+					os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+				except OSError:
+					pass
+				finally:
+					os.close(fd)
+				continue
+			continue
+		return
+
 	# Item files can be shared for shared files.
 	# Maintain a dictionary for them
 	def open_records_file(self, file_class, physical_name, first_letter_subdirectory=False):
@@ -112,17 +164,33 @@ class vss_database:
 		return file
 
 	def get_long_name(self, name:vss_name) -> str:
-		logical_name = name.short_name
 		if name.name_file_offset != 0:
+			# Only the names found in the name record are cached. Those only depend on
+			# the name record offset and the project flag. The short name fallback is not cached,
+			# because the key doesn't include the short name
+			long_name_key = (name.name_file_offset << 1) | (name.flags & 1)
+			long_name:str = self.long_name_dict.get(long_name_key, None)
+			if long_name is not None:
+				return long_name
+
 			name_record = self.name_file.get_name_record(name.name_file_offset)
-			logical_name = name_record.get(
-						name_record.NameKind.Project if name.is_project() else name_record.NameKind.Long,
-						logical_name)
-		long_name:str = self.logical_name_dict.get(logical_name, None)
-		if long_name is None:
-			long_name = logical_name.decode(self.encoding)
-			self.logical_name_dict[logical_name] = long_name
-		return long_name
+			long_name_bytes = name_record.get(
+						name_record.NameKind.Project if name.is_project() else name_record.NameKind.Long)
+			if long_name_bytes is not None:
+				long_name = self.decode_string(long_name_bytes)
+				self.long_name_dict[long_name_key] = long_name
+				return long_name
+
+		return self.decode_string(name.short_name)
+
+	# Names, authors, labels and paths repeat over many revisions.
+	# Decode each distinct byte string only once, and share the resulting 'str' object
+	def decode_string(self, s:bytes) -> str:
+		decoded:str = self.decoded_string_dict.get(s, None)
+		if decoded is None:
+			decoded = s.decode(self.encoding)
+			self.decoded_string_dict[s] = decoded
+		return decoded
 
 	def get_index_name(self, short_name:bytes) -> bytes:
 		# This name is used for case-insensitive indexing in the project items, even if short_name is empty.
@@ -135,10 +203,15 @@ class vss_database:
 		return index_name
 
 	def get_physical_name(self, physical_name:bytes) -> str:
-		physical_name = physical_name.upper()
+		# Look up the name as stored first, to avoid upper() for names seen before.
+		# The dictionary has both as stored and uppercased names as keys
 		decoded_name:str = self.physical_name_dict.get(physical_name)
 		if decoded_name is None:
-			decoded_name = physical_name.decode('ascii')
+			upper_name = physical_name.upper()
+			decoded_name = self.physical_name_dict.get(upper_name)
+			if decoded_name is None:
+				decoded_name = upper_name.decode('ascii')
+				self.physical_name_dict[upper_name] = decoded_name
 			self.physical_name_dict[physical_name] = decoded_name
 		return decoded_name
 
@@ -13,7 +13,7 @@
 #   limitations under the License.
 
 from __future__ import annotations
-from typing import DefaultDict, Iterator
+from typing import Iterator
 
 from .vss_revision import vss_full_name
 
@@ -90,8 +90,8 @@ class vss_item:
 			print("%sEntry flags=%s" % (indent, ProjectEntryFlag(self.flags)), file=fd)
 
 		if verbose & VerboseFlags.DatabaseFiles:
-			verbose &= ~(VerboseFlags.ProjectRevisions|VerboseFlags.FileRevisions)
-		elif verbose & (VerboseFlags.ProjectRevisions|VerboseFlags.FileRevisions):
+			verbose &= ~VerboseFlags.Revisions
+		elif verbose & VerboseFlags.Revisions:
 			verbose &= ~VerboseFlags.Records
 		elif not verbose & VerboseFlags.Records:
 			return
@@ -175,6 +175,10 @@ class vss_file(vss_item):
 		super().print(fd, indent+'  ', verbose & ~VerboseFlags.ProjectRevisions)
 		return
 
+# Combined verbose masks for printing a project and its child files
+print_project_mask = VerboseFlags.Projects|VerboseFlags.ProjectRevisions|VerboseFlags.DatabaseFiles
+print_file_mask = VerboseFlags.Files|VerboseFlags.FileRevisions|VerboseFlags.DatabaseFiles
+
 class vss_project(vss_item):
 
 	file_item_type = vss_file
@@ -185,7 +189,7 @@ class vss_project(vss_item):
 		self.item_file:vss_project_item_file
 
 		# items_by_logical_name only contains active (not deleted) child items
-		self.items_by_logical_name:DefaultDict[str,vss_item] = {}
+		self.items_by_logical_name:dict[str,vss_item] = {}
 		self.items_array = []
 		if self.item_file is None:
 			return
@@ -202,7 +206,7 @@ class vss_project(vss_item):
 		project_entry_idx = 0
 		for entry in project_entry_file.read_all_records(vss_project_entry_record):
 			assert(entry.is_file_entry() or (entry.is_project_entry() and entry.pinned_version == 0))
-			item_full_name = vss_full_name(database, entry.name, entry.physical)
+			item_full_name = vss_full_name.get(database, entry.name, entry.physical)
 			# In some databases (restored from old version?),
 			# order of items after [share A from X, delete A, branch A from Y]
 			# may not match the recovered order.
@@ -345,7 +349,7 @@ class vss_project(vss_item):
 					item.print(fd, indent, verbose)
 			return
 
-		if verbose & (VerboseFlags.Projects|VerboseFlags.ProjectRevisions|VerboseFlags.DatabaseFiles):
+		if verbose & print_project_mask:
 			print("\n%sProject %s" % (indent, self.make_full_path()), file=fd)
 			super().print(fd, indent+'  ', verbose & ~VerboseFlags.FileRevisions)
 
@@ -354,6 +358,6 @@ class vss_project(vss_item):
 		for item in self.all_items():
 			if item.is_project():
 				item.print(fd, indent, verbose)
-			elif verbose & (VerboseFlags.Files|VerboseFlags.FileRevisions|VerboseFlags.DatabaseFiles):
+			elif verbose & print_file_mask:
 				item.print(fd, indent, verbose & ~VerboseFlags.ProjectRevisions)
 		return
@@ -29,6 +29,15 @@ class ItemFileType(IntEnum):
 	Project = 1
 	File    = 2
 
+# Printable names of item file types, indexed by the raw integer type
+item_file_type_str = {
+	int(ItemFileType.Project) : 'Project',
+	int(ItemFileType.File) : 'File',
+}
+
+# Combined verbose masks, evaluated once instead of on every print call
+print_item_file_mask = VerboseFlags.FileHeaders|VerboseFlags.Records
+
 class vss_item_file_header:
 	ITEM_FILE_VERSION = 6
 
@@ -65,7 +74,7 @@ class vss_item_file_header:
 
 	def print(self, fd, indent='', verbose=VerboseFlags.Files):
 		print("%sFile type: %s, version: %d" %
-			(indent, 'Project' if self.file_type == ItemFileType.Project else 'File', self.file_version), file=fd)
+			(indent, item_file_type_str.get(self.file_type, 'File'), self.file_version), file=fd)
 		if any(self.filler_words):
 			print("%sFiller: %08X %08X %08X %08X" % (indent, *self.filler_words), file=fd)
 		return
@@ -73,6 +82,9 @@ class vss_item_file_header:
 class vss_item_header_record(vss_record):
 
 	SIGNATURE = b"DH"
+	__slots__ = ('item_type', 'num_revisions', 'name', 'first_revision', 'data_ext',
+				'first_revision_offset', 'last_revision_offset', 'eof_offset', 'rights_offset',
+				'item_header_filler_words')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -116,8 +128,8 @@ class vss_item_header_record(vss_record):
 		super().print(fd, indent, verbose)
 
 		print("%sItem Type: %s - Revisions: %d - Name: %s" % (indent,
-						'Project' if self.item_type == ItemFileType.Project else 'File',
-						self.num_revisions, self.decode(self.name.short_name)), file=fd)
+						item_file_type_str.get(self.item_type, 'File'),
+						self.num_revisions, self.reader.decode_string(self.name.short_name)), file=fd)
 		if self.name.name_file_offset != 0:
 			print("%sName offset: %06X" % (indent, self.name.name_file_offset), file=fd)
 		print("%sFirst revision: #%3d" % (indent, self.first_revision), file=fd)
@@ -164,6 +176,10 @@ class FileHeaderFlags(IntFlag):
 		return '|'.join(flags_list)
 
 class vss_file_header_record(vss_item_header_record):
+	__slots__ = ('flags', 'branch_file', 'branch_offset', 'project_offset',
+				'branch_count', 'project_count', 'first_checkout_offset', 'last_checkout_offset',
+				'data_crc', 'file_header_filler_words',
+				'last_rev_timestamp', 'modification_timestamp', 'creation_timestamp')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -227,6 +243,7 @@ class vss_file_header_record(vss_item_header_record):
 		return
 
 class vss_project_header_record(vss_item_header_record):
+	__slots__ = ('parent_project', 'parent_file', 'total_items', 'subprojects')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -269,8 +286,10 @@ class vss_item_file(vss_record_file):
 		if self.header.item_type != self.file_header.file_type:
 			raise BadHeaderException("Header record type mismatch")
 
-		# Fill the record dictionary
-		self.read_all_records(vss_item_record_factory, last_offset=self.header.eof_offset)
+		# Fill the record dictionary. The records start right after the header record,
+		# which is kept separately in self.header and is not parsed again.
+		self.read_all_records(vss_item_record_factory,
+			offset=self.header.header.end_offset(), last_offset=self.header.eof_offset)
 
 		self.revisions:List[vss_revision] = []
 		return
@@ -286,14 +305,14 @@ class vss_item_file(vss_record_file):
 		return self.header.num_revisions
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileHeaders):
-		if verbose & (VerboseFlags.FileHeaders|VerboseFlags.Records):
+		if verbose & print_item_file_mask:
 			print("%sItem file %s, size: %06X" % (indent, self.filename, self.file_size), file=fd)
 			super().print(fd, indent + '  ', verbose)
 
 		if verbose & VerboseFlags.Records:
 			# print all records
 			super().print(fd, indent, verbose|VerboseFlags.FileHeaders)
-		elif verbose & (VerboseFlags.FileRevisions|VerboseFlags.ProjectRevisions):
+		elif verbose & VerboseFlags.Revisions:
 			super().print(fd, indent, verbose)
 			for revision in self.revisions:
 				print('', file=fd)	# insert an empty line
@@ -336,11 +355,14 @@ class vss_project_item_file(vss_item_file):
 			revision.apply_to_project_items(self)
 		return
 
+	# Note that the items array methods below are not cacheable,
+	# because the items array gets modified as the revisions are applied.
 	def find_item(self, full_name):
+		items_array = self.items_array
 		item_idx = self.find_item_index(full_name)
-		if item_idx >= len(self.items_array):
+		if item_idx >= len(items_array):
 			return -1
-		item = self.items_array[item_idx]
+		item = items_array[item_idx]
 		if item.index_name == full_name.index_name \
 				and item.physical_name == full_name.physical_name:
 			return item_idx
@@ -348,13 +370,16 @@ class vss_project_item_file(vss_item_file):
 
 	### Finds either the item index, or the insertion point for the new item
 	def find_item_index(self, full_name):
-		top = len(self.items_array)
+		items_array = self.items_array
+		index_name = full_name.index_name
+		num_items = len(items_array)
+		top = num_items
 		bottom = 0
 		middle = 0
 		# Search by bisection. Find an index of last item less than we're looking for
 		while bottom != top:
 			middle = (bottom + top + 1) // 2
-			if full_name.index_name > self.items_array[middle-1].index_name:
+			if index_name > items_array[middle-1].index_name:
 				bottom = middle
 				continue
 			elif top == middle:
@@ -367,11 +392,10 @@ class vss_project_item_file(vss_item_file):
 		# There can be Multiple items with same index name can.
 		# They're not sorted by physical name.
 		# They're inserted at index 0.
-		top = len(self.items_array)
 		middle = bottom
-		while middle < top:
-			item = self.items_array[middle]
-			if item.index_name != full_name.index_name:
+		while middle < num_items:
+			item = items_array[middle]
+			if item.index_name != index_name:
 				break
 			if item.physical_name == full_name.physical_name:
 				# Found
@@ -381,14 +405,15 @@ class vss_project_item_file(vss_item_file):
 		return bottom
 
 	def remove_item(self, full_name):
+		# find_item only returns a valid index, or -1
 		item_idx = self.find_item(full_name)
-		if item_idx >= 0 and item_idx < len(self.items_array):
+		if item_idx >= 0:
 			return (item_idx, self.items_array.pop(item_idx))
 		else:
 			return (item_idx, None)
 
 	def remove_item_by_idx(self, item_idx):
-		if item_idx >= 0 and item_idx < len(self.items_array):
+		if 0 <= item_idx < len(self.items_array):
 			return (item_idx, self.items_array.pop(item_idx))
 		else:
 			return (item_idx, None)
@@ -399,9 +424,10 @@ class vss_project_item_file(vss_item_file):
 		return item_idx
 
 	def get_item(self, item_idx):
-		if item_idx >= len(self.items_array):
+		items_array = self.items_array
+		if item_idx >= len(items_array):
 			return None
-		return self.items_array[item_idx]
+		return items_array[item_idx]
 
 	def insert_item(self, item_idx, full_name):
 		self.items_array.insert(item_idx, full_name)
@@ -426,6 +452,8 @@ class vss_file_item_file(vss_item_file):
 		self.header:vss_file_header_record
 		with database.open_data_file(self.get_data_file_name()) as file:
 			self.last_data = file.read()
+		# Calculated on demand by get_last_data_crc()
+		self.last_data_crc:int = None
 
 		if self.header.branch_file:
 			self.branch_parent = database.open_records_file(vss_file_item_file,
@@ -500,6 +528,11 @@ class vss_file_item_file(vss_item_file):
 	def get_creation_timestamp(self):
 		return self.get_revision(self.header.first_revision).timestamp
 
+	def get_last_data_crc(self):
+		if self.last_data_crc is None:
+			self.last_data_crc = crc32.calculate(self.last_data)
+		return self.last_data_crc
+
 	def get_revision_data(self, version:int)->bytes:
 		revision = self.get_revision(version)
 		if revision is None:
@@ -511,7 +544,7 @@ class vss_file_item_file(vss_item_file):
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileHeaders):
 		super().print(fd, indent, verbose)
 
-		crc = crc32.calculate(self.last_data)
+		crc = self.get_last_data_crc()
 		if crc != self.header.data_crc:
 			print("header.data_crc=%08X, calculated: %08X" % (self.header.data_crc, crc), file=fd)
 
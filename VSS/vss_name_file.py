@@ -13,7 +13,7 @@
 #   limitations under the License.
 
 from __future__ import annotations
-from typing import DefaultDict
+from typing import List
 from .vss_record import vss_record, vss_record_header
 from .vss_record_file import vss_record_file
 from .vss_database import vss_database
@@ -23,6 +23,7 @@ from .vss_verbose import VerboseFlags
 class vss_name_header_record(vss_record):
 
 	SIGNATURE = b"HN"
+	__slots__ = ('eof_offset', 'filler_words')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -32,14 +33,15 @@ class vss_name_header_record(vss_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
 		self.filler_words = (
-			self.reader.read_uint32(),
-			self.reader.read_uint32(),
-			self.reader.read_uint32(),
-			self.reader.read_uint32(),
+			reader.read_uint32(),
+			reader.read_uint32(),
+			reader.read_uint32(),
+			reader.read_uint32(),
 			)
-		self.eof_offset = self.reader.read_int32()
+		self.eof_offset = reader.read_int32()
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileHeaders):
@@ -53,6 +55,7 @@ class vss_name_header_record(vss_record):
 class vss_name_record(vss_record):
 
 	SIGNATURE = b"SN"
+	__slots__ = ('names', 'other_names', 'name_kind_order')
 
 	class NameKind(IntEnum):
 		Dos        = 1
@@ -61,16 +64,28 @@ class vss_name_record(vss_record):
 		Project    = 10
 
 		def __str__(self):
-			if self == self.Dos: return 'Dos'
-			if self == self.Long: return 'Long'
-			if self == self.MacOS: return 'MacOS'
-			if self == self.Project: return 'Project'
-			return str(int(self))
+			return self.name
+
+	# Printable name of a raw integer kind. Unknown kinds are printed as a number
+	@classmethod
+	def name_kind_str(cls, name_kind:int)->str:
+		try:
+			return str(cls.NameKind(name_kind))
+		except ValueError:
+			return str(name_kind)
+
+	# Known name kinds are stored in a fixed size list, in this order
+	name_kinds = (NameKind.Dos, NameKind.Long, NameKind.MacOS, NameKind.Project)
+	name_kind_index = {int(kind) : idx for idx, kind in enumerate(name_kinds)}
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
 
-		self.names:DefaultDict[int,str] = {}
+		self.names:List[bytes] = [None] * len(self.name_kinds)
+		# Names of unknown kinds, if any
+		self.other_names:dict[int,bytes] = None
+		# Raw name kinds in the order they're stored in the record, for print
+		self.name_kind_order:List[int] = []
 		return
 
 	def read(self):
@@ -83,18 +98,44 @@ class vss_name_record(vss_record):
 		for i in range(name_kind_count):
 			name_kind = reader.read_int16()
 			name_offset = reader.read_int16()
-			self.names[name_kind] = name_str_reader.read_byte_string_at(name_offset)
+			name = name_str_reader.read_byte_string_at(name_offset)
+			if self.get(name_kind) is None:
+				self.name_kind_order.append(name_kind)
+			idx = self.name_kind_index.get(name_kind, None)
+			if idx is not None:
+				self.names[idx] = name
+			elif self.other_names is None:
+				self.other_names = {name_kind : name}
+			else:
+				self.other_names[name_kind] = name
 		return
 
 	def get(self, name_kind, default_value=None):
-		return self.names.get(int(name_kind), default_value)
+		idx = self.name_kind_index.get(name_kind, None)
+		if idx is not None:
+			name = self.names[idx]
+		elif self.other_names is not None:
+			name = self.other_names.get(name_kind, None)
+		else:
+			name = None
+		if name is None:
+			return default_value
+		return name
+
+	# Yields (name kind, name) in the record order
+	def all_names(self):
+		for name_kind in self.name_kind_order:
+			yield name_kind, self.get(name_kind)
+		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.Records):
 		super().print(fd, indent, verbose)
 
-		print("%sNum names: %d" % (indent, len(self.names)), file=fd)
-		for name_kind, name in self.names.items():
-			print("%s  %s: %s" % (indent, self.NameKind(name_kind), self.decode(name)), file=fd)
+		names = list(self.all_names())
+		print("%sNum names: %d" % (indent, len(names)), file=fd)
+		for name_kind, name in names:
+			print("%s  %s: %s" % (indent, self.name_kind_str(name_kind),
+							self.decode(name)), file=fd)
 
 		return
 
@@ -105,8 +146,9 @@ class vss_name_file(vss_record_file):
 
 		self.header:vss_name_header_record = self.read_record(vss_name_header_record)
 
-		# Fill the record dictionary
-		self.read_all_records(vss_name_record, last_offset=self.header.eof_offset)
+		# Fill the record dictionary, starting right after the header record
+		self.read_all_records(vss_name_record,
+			offset=self.header.header.end_offset(), last_offset=self.header.eof_offset)
 		return
 
 	def get_name_record(self, name_offset)->vss_name_record:
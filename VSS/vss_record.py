@@ -16,6 +16,8 @@
 from __future__ import annotations
 import sys
 import struct
+import functools
+import mmap
 
 if sys.version_info < (3, 9):
 	sys.exit("vss2git: This package requires Python 3.9+")
@@ -24,34 +26,118 @@ from typing import List
 from .vss_exception import EndOfBufferException, UnalignedReadException, RecordCrcException, RecordNotFoundException
 from .vss_verbose import VerboseFlags
 
+# CRC-32 implementation with zlib semantics.
+# If available, ISA-L (python-isal package) provides a faster CRC-32, using carry-less multiply (PCLMULQDQ).
+try:
+	from isal.isal_zlib import crc32 as zlib_crc32
+except ImportError:
+	try:
+		from zlib import crc32 as zlib_crc32
+	except ImportError:
+		zlib_crc32 = None
+
+# Pre-built structs for scalar reads. unpack_from reads directly from the buffer,
+# without making a temporary bytes object
+int16_struct = struct.Struct(b'<h')
+uint16_struct = struct.Struct(b'<H')
+int32_struct = struct.Struct(b'<i')
+uint32_struct = struct.Struct(b'<I')
+
 import datetime
+# Made once, not on every conversion
+unix_epoch = datetime.datetime(1970, 1, 1)
 def timestamp_to_datetime(timestamp:int):
-	return datetime.datetime(1970, 1, 1) + datetime.timedelta(0, timestamp)
-
-class crc32:
-	# Make the CRC table
-	POLY=0xEDB88320
-	table=[]
+	return unix_epoch + datetime.timedelta(seconds=timestamp)
+
+### Make the CRC tables.
+# slice_tables[0] is the regular byte-at-a-time CRC table.
+# slice_tables[k][b] is CRC of byte 'b' followed by 'k' zero bytes, for slicing-by-8 calculation.
+# The tables are kept as lists: indexing a list returns an existing int object,
+# while indexing array.array('I') has to make a new int object, which is measurably slower.
+def make_crc_tables(poly:int, num_tables:int=8)->List[List[int]]:
+	table = []
 	for i in range(256):
 		value = i
 		for j in range(8):
 			if value & 1:
-				value = POLY ^ (value >> 1)
+				value = poly ^ (value >> 1)
 			else:
 				value >>= 1
+			continue
 
 		table.append(value)
 		continue
 
+	slice_tables = [table]
+	for k in range(1, num_tables):
+		slice_tables.append([(value >> 8) ^ table[value & 0xFF] for value in slice_tables[-1]])
+		continue
+	return slice_tables
+
+class crc32:
+	POLY=0xEDB88320
+	slice_tables = make_crc_tables(POLY)
+	table = slice_tables[0]
+	qword_struct = struct.Struct(b'<Q')
+
+	### Pure Python CRC calculation, used if zlib is not available.
+	# Uses slicing-by-8: 8 bytes are processed per loop iteration
 	@staticmethod
-	def calculate(data:bytes, initial=0,final=0, offset=0, length=-1):
+	def calculate_table(data:bytes, initial=0,final=0, offset=0, length=-1):
 		crc = initial
 		if length < 0:
 			length = len(data) - offset
-		for i in range(offset, offset + length):
-			crc = (crc >> 8) ^ crc32.table[0xFF & (crc ^ data[i])];
+		view = memoryview(data)[offset:offset + length]
+		qwords_length = length & ~7
+		t0, t1, t2, t3, t4, t5, t6, t7 = crc32.slice_tables
+		for qword, in crc32.qword_struct.iter_unpack(view[:qwords_length]):
+			low = crc ^ (qword & 0xFFFFFFFF)
+			high = qword >> 32
+			crc = (t7[low & 0xFF] ^ t6[(low >> 8) & 0xFF]
+				^ t5[(low >> 16) & 0xFF] ^ t4[low >> 24]
+				^ t3[high & 0xFF] ^ t2[(high >> 8) & 0xFF]
+				^ t1[(high >> 16) & 0xFF] ^ t0[high >> 24])
+			continue
+		# Iterate the remaining bytes directly, instead of indexing the buffer
+		for byte in view[qwords_length:]:
+			crc = (crc >> 8) ^ t0[0xFF & (crc ^ byte)]
+			continue
 		return crc ^ final
 
+	### zlib.crc32 (and ISA-L crc32) uses the same polynomial, but it inverts the CRC
+	# before and after the calculation. VSS CRC doesn't do that.
+	@staticmethod
+	def calculate_zlib(data:bytes, initial=0,final=0, offset=0, length=-1):
+		view = memoryview(data)
+		if length < 0:
+			view = view[offset:]
+		else:
+			view = view[offset:offset + length]
+		return zlib_crc32(view, initial ^ 0xFFFFFFFF) ^ 0xFFFFFFFF ^ final
+
+	### Thin helpers for the record CRC: no initial and final value
+	@staticmethod
+	def calculate_slice_zlib(data:bytes, start:int, length:int):
+		return zlib_crc32(memoryview(data)[start:start + length], 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+	@staticmethod
+	def calculate_slice_table(data:bytes, start:int, length:int):
+		return crc32.calculate_table(data, 0, 0, start, length)
+
+	### Select the CRC implementation. The pure Python implementation
+	# can be forced, to validate the zlib/ISA-L results against it.
+	@classmethod
+	def select_implementation(cls, pure_python:bool=False):
+		if pure_python or zlib_crc32 is None:
+			cls.calculate = staticmethod(cls.calculate_table)
+			cls.calculate_slice = staticmethod(cls.calculate_slice_table)
+		else:
+			cls.calculate = staticmethod(cls.calculate_zlib)
+			cls.calculate_slice = staticmethod(cls.calculate_slice_zlib)
+		return
+
+crc32.select_implementation()
+
 class vss_name:
 	unpack_format = struct.Struct(b'<H34sI')
 
@@ -66,15 +152,23 @@ class vss_name:
 		return 0 != (self.flags & 1)
 
 def zero_terminated(src):
-	zero_byte_pos = src.find(0)
-	if zero_byte_pos >= 0:
-		src = src[0:zero_byte_pos]
-	return src
+	# partition() is a single C call, and returns the original object if there's no zero
+	return src.partition(b'\0')[0]
 
+### The reader parses records from a memory buffer holding the whole file.
+# It never reads from the file itself: all read functions operate on 'data' slices.
 class vss_record_reader:
+	__slots__ = ('data', 'slice_offset', 'offset', 'length', 'encoding', 'decode_string')
+
 	# If the length argument is supplied, it means the length after 'slice_offset' in the buffer
 	# If slice_offset is not specified, it's same as offset
-	def __init__(self, data:bytes, length:int=-1, slice_offset:int=0, encoding='utf-8'):
+	# 'data' can be 'bytes' or a memory mapped file (mmap.mmap).
+	# Only slicing, find() and buffer protocol (unpack_from, crc32) are used on it,
+	# which are supported by both.
+	# 'decode_string' is the database memo (vss_database.decode_string) used to decode names.
+	# Without a database, the names are decoded with 'encoding' every time.
+	def __init__(self, data:bytes|mmap.mmap, length:int=-1, slice_offset:int=0, encoding='utf-8',
+				decode_string=None):
 		data_len = len(data)
 		if length == -1:
 			length = data_len - slice_offset
@@ -98,6 +192,9 @@ class vss_record_reader:
 		# length of data to read, starting from 'slice_offset'
 		self.length = length
 		self.encoding = encoding
+		if decode_string is None:
+			decode_string = self.decode
+		self.decode_string = decode_string
 		return
 
 	def clone(self, additional_offset:int=0, length:int=None):
@@ -113,19 +210,32 @@ class vss_record_reader:
 			raise EndOfBufferException(
 				"Attempted slice of 0x%X bytes with only 0x%X bytes remaining in buffer"
 				% (length, self.length - offset))
-		return vss_record_reader(self.data,
-								slice_offset=offset+self.slice_offset,
-								length=length,
-								encoding=self.encoding)
+		# The slice is already checked against this reader bounds.
+		# Make the new reader directly, without the checks in __init__
+		reader = object.__new__(vss_record_reader)
+		reader.data = self.data
+		reader.slice_offset = offset + self.slice_offset
+		reader.offset = 0
+		reader.length = length
+		reader.encoding = self.encoding
+		reader.decode_string = self.decode_string
+		return reader
 
 	def crc16(self, length=-1):
 		if length < 0:
 			length = self.length - self.offset
-		else:
+		elif self.offset + length > self.length:
 			self.check_read(length)
-		crc = crc32.calculate(self.data, offset=self.offset+self.slice_offset, length=length)
-		return 0xFFFF & (crc ^ (crc >> 16))
+		crc = crc32.calculate_slice(self.data, self.offset+self.slice_offset, length)
+		return (crc ^ (crc >> 16)) & 0xFFFF
+
+	# CRC16 of the whole slice, regardless of the current read offset.
+	# The slice is already checked against the buffer bounds
+	def crc16_all(self):
+		crc = crc32.calculate_slice(self.data, self.slice_offset, self.length)
+		return (crc ^ (crc >> 16)) & 0xFFFF
 
+	# Callers compare the offsets inline, and only call check_read* to raise the exception
 	def check_read(self, length:int):
 		if self.offset + length > self.length:
 			raise EndOfBufferException(
@@ -141,15 +251,27 @@ class vss_record_reader:
 		return
 
 	def read_bytes(self, length:int)->bytes:
-		self.check_read(length)
+		if self.offset + length > self.length:
+			self.check_read(length)
 		offset = self.offset + self.slice_offset
 		bytes_read = self.data[offset:offset+length]
 		self.offset += length
 		return bytes_read
 
+	# Returns a memoryview of the data, without copying it.
+	# Used for data blobs which are only going to be copied to a new buffer.
+	def read_view(self, length:int)->memoryview:
+		if self.offset + length > self.length:
+			self.check_read(length)
+		offset = self.offset + self.slice_offset
+		view = memoryview(self.data)[offset:offset+length]
+		self.offset += length
+		return view
+
 	# Read without updating the current offset
 	def read_bytes_at(self, offset:int, length:int)->bytes:
-		self.check_read_at(offset, length)
+		if offset + length > self.length:
+			self.check_read_at(offset, length)
 		offset += self.slice_offset
 		bytes_read = self.data[offset:offset+length]
 		# Not advancing self.offset
@@ -158,39 +280,72 @@ class vss_record_reader:
 	def read_int16(self, unaligned=False)->int:
 		if not unaligned and (self.offset & 1):
 			raise UnalignedReadException("Attempted read of 16-bit integer at unaligned offset %d" % (self.offset,))
-		return int.from_bytes(self.read_bytes(2), byteorder='little', signed=True)
+		if self.offset + 2 > self.length:
+			self.check_read(2)
+		value, = int16_struct.unpack_from(self.data, self.offset + self.slice_offset)
+		self.offset += 2
+		return value
 
 	def read_uint16(self, unaligned=False)->int:
-		return 0xFFFF & self.read_int16(unaligned)
+		if not unaligned and (self.offset & 1):
+			raise UnalignedReadException("Attempted read of 16-bit integer at unaligned offset %d" % (self.offset,))
+		if self.offset + 2 > self.length:
+			self.check_read(2)
+		value, = uint16_struct.unpack_from(self.data, self.offset + self.slice_offset)
+		self.offset += 2
+		return value
 
 	# Read without updating the current offset (peek)
 	def read_int16_at(self, offset:int, unaligned=False)->int:
 		if not unaligned and ((self.offset + offset) & 1):
 			raise UnalignedReadException("Attempted read of 16-bit integer at unaligned offset %d" % (self.offset + offset,))
-		return int.from_bytes(self.read_bytes_at(offset, 2), byteorder='little', signed=True)
+		if offset + 2 > self.length:
+			self.check_read_at(offset, 2)
+		return int16_struct.unpack_from(self.data, offset + self.slice_offset)[0]
 
 	def read_uint16_at(self, offset:int, unaligned=False)->int:
-		return 0xFFFF & self.read_int16_at(offset, unaligned)
+		if not unaligned and ((self.offset + offset) & 1):
+			raise UnalignedReadException("Attempted read of 16-bit integer at unaligned offset %d" % (self.offset + offset,))
+		if offset + 2 > self.length:
+			self.check_read_at(offset, 2)
+		return uint16_struct.unpack_from(self.data, offset + self.slice_offset)[0]
 
 	def read_int32(self, unaligned=False)->int:
 		if not unaligned and (self.offset & 3):
 			raise UnalignedReadException("Attempted read of 32-bit integer at unaligned offset %d" % (self.offset,))
-		return int.from_bytes(self.read_bytes(4), byteorder='little', signed=True)
+		if self.offset + 4 > self.length:
+			self.check_read(4)
+		value, = int32_struct.unpack_from(self.data, self.offset + self.slice_offset)
+		self.offset += 4
+		return value
 
 	def read_uint32(self, unaligned=False)->int:
-		return 0xFFFFFFFF & self.read_int32(unaligned)
+		if not unaligned and (self.offset & 3):
+			raise UnalignedReadException("Attempted read of 32-bit integer at unaligned offset %d" % (self.offset,))
+		if self.offset + 4 > self.length:
+			self.check_read(4)
+		value, = uint32_struct.unpack_from(self.data, self.offset + self.slice_offset)
+		self.offset += 4
+		return value
 
 	# Read without updating the current offset
 	def read_int32_at(self, offset:int, unaligned=False)->int:
 		if not unaligned and ((self.offset + offset) & 1):
 			raise UnalignedReadException("Attempted read of 32-bit integer at unaligned offset %d" % (self.offset + offset,))
-		return int.from_bytes(self.read_bytes_at(offset, 4), byteorder='little', signed=True)
+		if offset + 4 > self.length:
+			self.check_read_at(offset, 4)
+		return int32_struct.unpack_from(self.data, offset + self.slice_offset)[0]
 
 	def read_uint32_at(self, offset:int, unaligned=False)->int:
-		return 0xFFFFFFFF & self.read_int32_at(offset, unaligned)
+		if not unaligned and ((self.offset + offset) & 1):
+			raise UnalignedReadException("Attempted read of 32-bit integer at unaligned offset %d" % (self.offset + offset,))
+		if offset + 4 > self.length:
+			self.check_read_at(offset, 4)
+		return uint32_struct.unpack_from(self.data, offset + self.slice_offset)[0]
 
 	def skip(self, skip_bytes:int):
-		self.check_read(skip_bytes)
+		if self.offset + skip_bytes > self.length:
+			self.check_read(skip_bytes)
 		self.offset += skip_bytes
 		return
 
@@ -201,17 +356,32 @@ class vss_record_reader:
 		if length < 0:
 			length = self.remaining()
 
-		result = self.read_byte_string_at(self.offset, length)
-		self.skip(length)
-		return result
+		offset = self.offset
+		if offset + length > self.length:
+			self.check_read(length)
+		self.offset = offset + length
+
+		# Same as read_byte_string_at, inlined for the fixed size fields
+		start = offset + self.slice_offset
+		end = self.data.find(b'\0', start, start + length)
+		if end < 0:
+			end = start + length
+		return self.data[start:end]
 
 	def read_byte_string_at(self, offset:int, length:int=-1)->bytes:
 		if length < 0:
 			self.check_read_at(offset, 0)
 			length = self.length - offset
+		else:
+			self.check_read_at(offset, length)
 
-		string_bytes = self.read_bytes_at(offset, length)
-		return zero_terminated(string_bytes)
+		# Find the zero terminator directly in the buffer (a C level scan),
+		# and only copy the string itself
+		start = offset + self.slice_offset
+		end = self.data.find(b'\0', start, start + length)
+		if end < 0:
+			end = start + length
+		return self.data[start:end]
 
 	def decode(self, s):
 		return s.decode(self.encoding)
@@ -219,78 +389,99 @@ class vss_record_reader:
 	def read_string(self, length:int=-1):
 		return self.decode(self.read_byte_string(length))
 
-	def unpack_at(self, offset, unpack_format:str|struct.Struct):
-		if type(unpack_format) is str:
-			size = struct.calcsize(unpack_format)
-			self.check_read_at(offset, size)
-			return struct.unpack_from(unpack_format, self.data, offset + self.slice_offset), size
-		else:
-			size = unpack_format.size
+	# All callers pass pre-compiled struct.Struct objects
+	def unpack_at(self, offset, unpack_format:struct.Struct):
+		size = unpack_format.size
+		if offset + size > self.length:
 			self.check_read_at(offset, size)
-			return unpack_format.unpack_from(self.data, offset + self.slice_offset), size
+		return unpack_format.unpack_from(self.data, offset + self.slice_offset), size
 
-	def unpack(self, unpack_format:str|struct.Struct):
-		unpacked, size = self.unpack_at(self.offset, unpack_format)
-		self.offset += size
-		return unpacked
+	def unpack(self, unpack_format:struct.Struct):
+		offset = self.offset
+		size = unpack_format.size
+		if offset + size > self.length:
+			self.check_read(size)
+		self.offset = offset + size
+		return unpack_format.unpack_from(self.data, offset + self.slice_offset)
 
 	def read_name(self):
-		flags, short_name, name_file_offset = self.unpack(vss_name.unpack_format)
+		return self.make_name(*self.unpack(vss_name.unpack_format))
 
+	# Make vss_name object from its unpacked fields
+	# Used by the records which unpack the name together with other fields
+	def make_name(self, flags:int, short_name:bytes, name_file_offset:int):
 		return vss_name(flags, zero_terminated(short_name), name_file_offset)
 
 class vss_record_header:
 
 	LENGTH = 8
-	unpack_struct = struct.Struct(b'<I2sH')
+	# The signature is read as a 16 bit integer, to make record class lookup faster
+	unpack_struct = struct.Struct(b'<IHH')
 
 	def __init__(self, reader:vss_record_reader):
 		self.offset:int = None
 		self.length:int = None
-		self.signature:bytes = None
+		self.signature_int:int = None
 		self.file_crc: int = None
-		self.actual_crc:int = None
+		# actual_crc is calculated on first access
 
 		self.read(reader)
 		return
 
+	# The CRC is only calculated when needed.
+	# Comment records don't have a CRC, it's not checked for them (unless printed)
+	@functools.cached_property
+	def actual_crc(self)->int:
+		# The slice reader covers exactly the record data.
+		# Its read offset may have moved already, don't use it
+		return self.reader.crc16_all()
+
 	def is_crc_valid(self):
 		return self.file_crc == self.actual_crc
 
+	@property
+	def signature(self)->bytes:
+		return self.signature_int.to_bytes(2, 'little')
+
+	# Offset of the next record in the file
+	def end_offset(self):
+		return self.offset + self.LENGTH + self.length
+
 	def read(self, reader:vss_record_reader):
 		self.offset = reader.offset
-		self.length, self.signature, self.file_crc = reader.unpack(self.unpack_struct)
+		self.length, self.signature_int, self.file_crc = reader.unpack(self.unpack_struct)
 
 		# Create a slice reader:
 		self.reader = reader.clone(length=self.length)
 
-		self.actual_crc = self.reader.crc16(self.length)
-
-		# Advance the original reader beyond this whole record
-		reader.skip(self.length)
+		# Advance the original reader beyond this whole record.
+		# clone() has already checked that the record fits in the buffer
+		reader.offset += self.length
 		return
 
 	def check_crc(self):
 		# Comment record CRC always comes as 0
-		if self.signature != vss_comment_record.SIGNATURE and not self.is_crc_valid():
+		if self.signature_int != vss_comment_record.SIGNATURE_INT and not self.is_crc_valid():
 			raise RecordCrcException("CRC error in %s record: expected=%04X, actual=%04X"
 							% (self.signature.decode(), self.file_crc, self.actual_crc))
 		return
 
-	def check_signature(self, expected:bytes):
-		if self.signature != expected:
+	# 'expected' is the signature as 16 bit integer: SIGNATURE_INT of the record class
+	def check_signature(self, expected:int):
+		if self.signature_int != expected:
 			raise RecordNotFoundException("Unexpected record signature: expected=%s, actual=%s"
-					% (expected.decode(), self.signature.decode()))
+					% (expected.to_bytes(2, 'little').decode(), self.signature.decode()))
+		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
 		# The signature is printed as if it'a a two-character literal: characters reversed
 		print_str = "%sRECORD: '%c%c' - Length: 0x%X (%d) - Offset: %06X" % (
 			indent,
-			chr(self.signature[1]), chr(self.signature[0]),
+			chr(self.signature_int >> 8), chr(self.signature_int & 0xFF),
 			self.length + self.LENGTH, self.length + self.LENGTH,
 			self.offset)
 		if (verbose & VerboseFlags.RecordCrc) \
-			and self.signature != vss_comment_record.SIGNATURE:
+			and self.signature_int != vss_comment_record.SIGNATURE_INT:
 			print_str += " - CRC: %04X (%s: %04X)" % (
 				self.file_crc, "valid" if self.is_crc_valid() else "INVALID", self.actual_crc)
 		print(print_str, file=fd)
@@ -304,29 +495,43 @@ def print_hex(fd, reader, indent='', start_offset=0, count=None):
 	if count is None:
 		count = reader.length
 
-	offset = start_offset
-	while offset < count:
-		# Printing 16 bytes per line
-		remainder = count-offset
-		if remainder >= 16:
-			data = reader.read_bytes_at(offset, 16)
-		else:
-			data = reader.read_bytes_at(offset, remainder)
-
-		dump_str = "%s %04X: %-48s | %16s |" % (indent, offset, data.hex(' '), data.translate(translate_table).decode(encoding='ascii'))
-		print(dump_str, file=fd)
+	if count <= start_offset:
+		return
 
-		offset += 16
+	# The whole range is read at once, and the dump is printed with a single call
+	all_data = reader.read_bytes_at(start_offset, count - start_offset)
+	# The translated text is all ASCII, it's decoded once for the whole range
+	all_text = all_data.translate(translate_table).decode(encoding='ascii')
+	dump_lines = []
+	for pos in range(0, len(all_data), 16):
+		# Printing 16 bytes per line
+		data = all_data[pos:pos+16]
+		dump_lines.append("%s %04X: %-48s | %16s |" % (indent, start_offset + pos, data.hex(' '), all_text[pos:pos+16]))
 		continue
+
+	print('\n'.join(dump_lines), file=fd)
 	return
 
 class vss_record:
 
+	# A subclass only gets rid of the per-instance __dict__
+	# if all classes in its hierarchy declare __slots__
+	__slots__ = ('header', 'reader', 'encoding', 'annotations')
+
 	def __init__(self, header:vss_record_header):
 		self.header:vss_record_header = header
 		self.reader:vss_record_reader = header.reader
 		self.encoding:str = self.reader.encoding
-		self.annotations:List[str] = None
+		# 'annotations' slot is only assigned when an annotation is added
+		return
+
+	# SIGNATURE_INT is the record signature as 16 bit integer,
+	# as it's read by vss_record_header
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		signature = cls.__dict__.get('SIGNATURE', None)
+		if signature is not None:
+			cls.SIGNATURE_INT = int.from_bytes(signature, 'little')
 		return
 
 	def read(self):
@@ -336,17 +541,19 @@ class vss_record:
 		return s.decode(self.encoding)
 
 	def add_annotation(self, annotation):
-		if self.annotations:
+		try:
 			self.annotations.append(annotation)
-		else:
-			self.annotations = [annotation]
+		except AttributeError:
+			self.annotations:List[str] = [annotation]
 		return
 
 	def decode_name(self, name:vss_name, physical_name=None):
 		if not name.short_name:
 			s = '""'
 		else:
-			s = self.decode(name.short_name)
+			# The same short names repeat in many records.
+			# The database memo decodes each of them only once
+			s = self.reader.decode_string(name.short_name)
 		if name.name_file_offset:
 			s += ' (name_offset: %X)' % (name.name_file_offset, )
 		if physical_name:
@@ -357,8 +564,9 @@ class vss_record:
 		if verbose & VerboseFlags.RecordHeaders:
 			self.header.print(fd, indent, verbose)
 
-		if self.annotations:
-			print(indent + ('\n' + indent).join(self.annotations), file=fd)
+		annotations = getattr(self, 'annotations', None)
+		if annotations:
+			print(indent + ('\n' + indent).join(annotations), file=fd)
 		return
 
 	@classmethod
@@ -372,6 +580,8 @@ class vss_record:
 class vss_branch_record(vss_record):
 
 	SIGNATURE = b"BF"
+	__slots__ = ('prev_branch_offset', 'branch_file')
+	unpack_format = struct.Struct(b'<i12s')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -383,8 +593,8 @@ class vss_branch_record(vss_record):
 	def read(self):
 		super().read()
 
-		self.prev_branch_offset = self.reader.read_int32()
-		self.branch_file = self.reader.read_byte_string(12)
+		self.prev_branch_offset, branch_file = self.reader.unpack(self.unpack_format)
+		self.branch_file = zero_terminated(branch_file)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -397,6 +607,10 @@ class vss_branch_record(vss_record):
 class vss_checkout_record(vss_record):
 
 	SIGNATURE = b"CF"
+	__slots__ = ('user', 'timestamp', 'working_dir', 'machine', 'project', 'comment',
+				'revision', 'flags', 'prev_checkout_offset', 'this_checkout_offset', 'checkouts')
+	# All fields are fixed size, read them in one unpack
+	unpack_format = struct.Struct(b'<32sI260s32s260s64shhiii')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -418,17 +632,25 @@ class vss_checkout_record(vss_record):
 		super().read()
 		reader = self.reader
 
-		self.user = reader.read_byte_string(32)
-		self.timestamp = reader.read_uint32()
-		self.working_dir = reader.read_byte_string(260)
-		self.machine = reader.read_byte_string(32)
-		self.project = reader.read_byte_string(260)
-		self.comment = reader.read_byte_string(64)
-		self.revision = reader.read_int16()
-		self.flags = reader.read_int16()
-		self.prev_checkout_offset = reader.read_int32()
-		self.this_checkout_offset = reader.read_int32()
-		self.checkouts = reader.read_int32()
+		(
+			user,
+			self.timestamp,
+			working_dir,
+			machine,
+			project,
+			comment,
+			self.revision,
+			self.flags,
+			self.prev_checkout_offset,
+			self.this_checkout_offset,
+			self.checkouts,
+		) = reader.unpack(self.unpack_format)
+
+		self.user = zero_terminated(user)
+		self.working_dir = zero_terminated(working_dir)
+		self.machine = zero_terminated(machine)
+		self.project = zero_terminated(project)
+		self.comment = zero_terminated(comment)
 
 		return
 
@@ -453,6 +675,7 @@ def indent_string(src, indent:str) ->str:
 class vss_comment_record(vss_record):
 
 	SIGNATURE = b"MC"
+	__slots__ = ('comment',)
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -474,6 +697,8 @@ class vss_comment_record(vss_record):
 class vss_project_record(vss_record):
 
 	SIGNATURE = b"PF"
+	__slots__ = ('prev_project_offset', 'project_file')
+	unpack_format = struct.Struct(b'<i12s')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -485,8 +710,8 @@ class vss_project_record(vss_record):
 	def read(self):
 		super().read()
 
-		self.prev_project_offset = self.reader.read_int32()
-		self.project_file = self.reader.read_byte_string(12)
+		self.prev_project_offset, project_file = self.reader.unpack(self.unpack_format)
+		self.project_file = zero_terminated(project_file)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -501,20 +726,16 @@ class vss_delta_operation:
 	DeltaCommandWriteSuccessor = 1
 	DeltaCommandStop = 2
 	unpack_format = struct.Struct(b'<HHII')
-
-	def __init__(self, reader:vss_record_reader):
-
-		(
-			self.command,
-			skip,
-			self.offset,
-			self.length,
-		) = reader.unpack(self.unpack_format)
-
-		if self.command == self.DeltaCommandWriteLog:
-			self.data = reader.read_bytes(self.length)
-		else:
-			self.data:bytes = None
+	__slots__ = ('command', 'offset', 'length', 'data')
+
+	# The operations are parsed by vss_delta_record.read
+	def __init__(self, command:int, offset:int, length:int, data:memoryview):
+		self.command:int = command
+		self.offset:int = offset
+		self.length:int = length
+		# Only present for DeltaCommandWriteLog.
+		# The data is not copied until the delta is applied
+		self.data:memoryview = data
 		return
 
 	def apply(self, base_data):
@@ -532,6 +753,7 @@ class vss_delta_operation:
 class vss_delta_record(vss_record):
 
 	SIGNATURE = b"FD"
+	__slots__ = ('delta_operations',)
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -543,16 +765,47 @@ class vss_delta_record(vss_record):
 		super().read()
 		reader = self.reader
 
+		# Parse the operations directly from the buffer, with a local cursor
+		data = reader.data
+		view = memoryview(data)
+		unpack_from = vss_delta_operation.unpack_format.unpack_from
+		op_size = vss_delta_operation.unpack_format.size
+		slice_offset = reader.slice_offset
+		pos = slice_offset + reader.offset
+		end = slice_offset + reader.length
+		delta_operations = self.delta_operations
+
 		while True:
-			op = vss_delta_operation(reader)
+			if pos + op_size > end:
+				reader.offset = pos - slice_offset
+				reader.check_read(op_size)
+			command, skip, offset, length = unpack_from(data, pos)
+			pos += op_size
 
-			if op.command == op.DeltaCommandStop:
+			if command == vss_delta_operation.DeltaCommandStop:
 				break
-			self.delta_operations.append(op)
+
+			if command == vss_delta_operation.DeltaCommandWriteLog:
+				if pos + length > end:
+					reader.offset = pos - slice_offset
+					reader.check_read(length)
+				op_data = view[pos:pos+length]
+				pos += length
+			else:
+				op_data = None
+
+			delta_operations.append(vss_delta_operation(command, offset, length, op_data))
+			continue
+
+		reader.offset = pos - slice_offset
 		return
 
 	def apply_delta(self, base_data):
-		return bytes().join(op.apply(base_data) for op in self.delta_operations)
+		# Slices of a memoryview are not copied. join() sums the lengths of all pieces,
+		# allocates the result once and copies each piece into it,
+		# which is the same as filling a pre-allocated bytearray, but without a final copy to bytes.
+		base_data = memoryview(base_data)
+		return b''.join([op.apply(base_data) for op in self.delta_operations])
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
 		super().print(fd, indent, verbose)
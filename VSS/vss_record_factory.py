@@ -22,24 +22,25 @@ from .vss_record import (
 from .vss_revision_record import vss_revision_record, vss_revision_record_factory
 
 class vss_item_record_factory:
+	# Keyed by the signature as 16 bit integer
 	class_dict = {
-			vss_comment_record.SIGNATURE : vss_comment_record,
-			vss_checkout_record.SIGNATURE : vss_checkout_record,
-			vss_project_record.SIGNATURE : vss_project_record,
-			vss_branch_record.SIGNATURE : vss_branch_record,
-			vss_revision_record.SIGNATURE : vss_revision_record_factory,
-			vss_delta_record.SIGNATURE : vss_delta_record,
+			vss_comment_record.SIGNATURE_INT : vss_comment_record,
+			vss_checkout_record.SIGNATURE_INT : vss_checkout_record,
+			vss_project_record.SIGNATURE_INT : vss_project_record,
+			vss_branch_record.SIGNATURE_INT : vss_branch_record,
+			vss_revision_record.SIGNATURE_INT : vss_revision_record_factory,
+			vss_delta_record.SIGNATURE_INT : vss_delta_record,
 		}
 
 	@classmethod
 	def create_record(cls, record_header)->vss_record:
-		record_class = cls.class_dict.get(record_header.signature, None)
+		record_class = cls.class_dict.get(record_header.signature_int, None)
 		if record_class is None:
 			return None
 		return record_class.create_record(record_header)
 
 	@classmethod
 	def valid_record_class(cls, record):
-		record_class = cls.class_dict.get(record.header.signature, None)
+		record_class = cls.class_dict.get(record.header.signature_int, None)
 		return record_class is not None and \
 			record_class.valid_record_class(record)
@@ -18,39 +18,42 @@ from .vss_exception import UnrecognizedRecordException, RecordClassMismatchExcep
 from .vss_record import *
 from .vss_verbose import VerboseFlags
 
-from typing import DefaultDict
-
 class vss_record_file:
+	# Shared by all files: (record type, requested class) -> bool
+	valid_record_class_cache:dict[tuple,bool] = {}
+
 	def __init__(self, database:vss_database, filename:str, first_letter_subdirectory=True):
 		self.filename = filename
 		self.header = None
 
-		with database.open_data_file(filename,
-				first_letter_subdirectory=first_letter_subdirectory) as file:
-			self.reader = vss_record_reader(file.read(), encoding=database.encoding)
-			self.file_size = self.reader.length
+		# The whole file is read (or mapped) at once; all records are then parsed from this buffer
+		self.reader = vss_record_reader(database.read_data_file(filename,
+				first_letter_subdirectory=first_letter_subdirectory), encoding=database.encoding,
+				decode_string=database.decode_string)
+		self.file_size = self.reader.length
 
 		# All records by offset
-		self.records:DefaultDict[int, vss_record] = {}
+		self.records:dict[int, vss_record] = {}
 		return
 
 	### Read one record, using 'record_factory' to create record object.
 	# The record must match its class SIGNATURE
 	# 'record_class' can also be a record factory.
 	def read_record(self, record_factory, offset:int=None, ignore_unknown:bool=False):
+		reader = self.reader
 		if offset is not None:
-			self.reader.offset = offset
+			reader.offset = offset
 		else:
-			offset = self.reader.offset
+			offset = reader.offset
 
 		try:
-			record_header = vss_record_header(self.reader)
+			record_header = vss_record_header(reader)
 			record_header.check_crc()
 
 			record = record_factory.create_record(record_header)
 
 			if record is not None:
-				record_header.check_signature(record.SIGNATURE)
+				record_header.check_signature(record.SIGNATURE_INT)
 				record.read()
 			elif not ignore_unknown:
 				raise UnrecognizedRecordException(
@@ -69,6 +72,45 @@ class vss_record_file:
 			offset = self.reader.offset
 		if last_offset is None:
 			last_offset = self.file_size
+		if not self.records:
+			self.read_records_fresh(record_factory, offset, last_offset, ignore_unknown)
+		else:
+			self.read_records_incremental(record_factory, offset, last_offset, ignore_unknown)
+		return self.records.values()
+
+	# Nothing has been read yet: no need to look for already read records.
+	# This is the same as calling read_record for each record,
+	# but with the loop state kept in locals, and only one exception handler for the whole file.
+	def read_records_fresh(self, record_factory, offset:int, last_offset:int, ignore_unknown:bool):
+		reader = self.reader
+		records = self.records
+		create_record = record_factory.create_record
+		last_offset -= vss_record_header.LENGTH
+		reader.offset = offset
+
+		try:
+			while offset <= last_offset:
+				record_header = vss_record_header(reader)
+				record_header.check_crc()
+
+				record = create_record(record_header)
+
+				if record is not None:
+					record_header.check_signature(record.SIGNATURE_INT)
+					record.read()
+					records[offset] = record
+				elif not ignore_unknown:
+					raise UnrecognizedRecordException(
+						"Unrecognized record signature %s in file %s" % (record_header.signature.decode(), self.filename))
+
+				offset = reader.offset
+				continue
+
+		except EndOfBufferException as e:
+			raise RecordTruncatedException(*e.args)
+		return
+
+	def read_records_incremental(self, record_factory, offset:int, last_offset:int, ignore_unknown:bool):
 		while offset + vss_record_header.LENGTH <= last_offset:
 			record = self.get_record(offset, record_factory)
 			if record is not None:
@@ -79,12 +121,22 @@ class vss_record_file:
 				self.records[offset] = record
 			offset = self.reader.offset
 			continue
-		return self.records.values()
+		return
 
 	def get_record(self, offset:int, record_class=None) -> vss_record:
 		record = self.records.get(offset, None)
-		if record is not None and record_class is not None and \
-				not record_class.valid_record_class(record):
+		# Most lookups ask for the exact class of the record (comment, delta),
+		# which doesn't need to go through valid_record_class()
+		if record is None or record_class is None or type(record) is record_class:
+			return record
+		# The record type is fully determined by its signature and revision action,
+		# so the result of valid_record_class() only depends on the record type
+		key = (type(record), record_class)
+		valid = self.valid_record_class_cache.get(key, None)
+		if valid is None:
+			valid = record_class.valid_record_class(record)
+			self.valid_record_class_cache[key] = valid
+		if not valid:
 			raise RecordClassMismatchException(
 				"Mismatched record class at offset %06X in item file %s, expected %s, actual %s"
 					% (offset, self.filename, record_class.__name__, type(record).__name__))
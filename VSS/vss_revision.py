@@ -23,12 +23,17 @@ from .vss_verbose import *
 class vss_revision:
 
 	PROJECT_REVISION = NotImplemented
+	# A subclass only gets rid of the per-instance __dict__
+	# if all classes in its hierarchy declare __slots__
+	__slots__ = ('revision_num', 'action', 'timestamp', 'author', 'revision_data', 'encoding',
+			'label_comment', 'comment', 'item_index')
 
 	def __init__(self, record:vss_revision_record, database, item_file:vss_item_file):
 		self.revision_num:int = record.revision_num
-		self.action = int(record.action)
+		# record.action is a plain int, as unpacked from the record
+		self.action = record.action
 		self.timestamp:int = record.timestamp
-		self.author = record.decode(record.user)
+		self.author = database.decode_string(record.user)
 		self.revision_data:bytes = None
 		self.encoding = database.encoding
 		self.label_comment:str = None
@@ -50,10 +55,11 @@ class vss_revision:
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileRevisions):
-		print("%sRevision: %d" % (indent, self.revision_num), file=fd)
-		print("%sBy: '%s', at: %s (%d)" % (indent, self.author,
-						timestamp_to_datetime(self.timestamp), self.timestamp), file=fd)
-		print("%s%s (%d)" % (indent, VssRevisionAction(self.action), self.action), file=fd)
+		# One print call for the fixed lines
+		print("%sRevision: %d\n%sBy: '%s', at: %s (%d)\n%s%s (%d)" % (
+						indent, self.revision_num,
+						indent, self.author, timestamp_to_datetime(self.timestamp), self.timestamp,
+						indent, action_names[self.action], self.action), file=fd)
 
 		if self.comment:
 			indent += '  '
@@ -61,10 +67,11 @@ class vss_revision:
 		return
 
 class vss_label_revision(vss_revision):
+	__slots__ = ('label',)
 
 	def __init__(self, record:vss_revision_record, database, item_file:vss_item_file):
 		super().__init__(record, database, item_file)
-		self.label:str = record.decode(record.label)
+		self.label:str = database.decode_string(record.label)
 
 		if record.label_comment_offset > 0 and record.label_comment_length > 0:
 			label_comment_record:vss_comment_record = item_file.get_record(
@@ -86,26 +93,35 @@ class vss_label_revision(vss_revision):
 class vss_full_name:
 	def __init__(self, database, logical_name:vss_name, physical_name:bytes):
 		self.is_project:bool = logical_name.is_project()
-		self.name:bytes = database.get_long_name(logical_name)
-		self.physical_name = database.get_physical_name(physical_name)
+		self.name:str = database.get_long_name(logical_name)
+		self.physical_name:str = database.get_physical_name(physical_name)
 		self.index_name:bytes = database.get_index_name(logical_name.short_name)
 		return
 
+	# vss_full_name objects are never modified after construction,
+	# and the same names are referred by many revisions. They are shared through the database dictionary.
+	# The long name depends on the project flag and the name file offset
+	@classmethod
+	def get(cls, database, logical_name:vss_name, physical_name:bytes):
+		key = (logical_name.short_name, logical_name.flags & 1, logical_name.name_file_offset, physical_name)
+		full_name = database.full_name_dict.get(key, None)
+		if full_name is None:
+			full_name = cls(database, logical_name, physical_name)
+			database.full_name_dict[key] = full_name
+		return full_name
+
+	# The string is only needed for printing, it's not made in __init__
 	def __str__(self):
-		s = self.name
-		if self.is_project:
-			s += '/'
-		if self.physical_name:
-			s += " (%s)" % (self.physical_name,)
-		return s
+		return f"{self.name}{'/' if self.is_project else ''}{f' ({self.physical_name})' if self.physical_name else ''}"
 
 class vss_named_revision(vss_revision):
+	__slots__ = ('full_name',)
 
 	def __init__(self, record:vss_revision_record, database, item_file:vss_item_file):
 		super().__init__(record, database, item_file)
-		self.full_name = vss_full_name(database, record.name, record.physical)
-		if self.full_name.is_project != self.PROJECT_REVISION:
-			assert(self.full_name.is_project == self.PROJECT_REVISION)
+		self.full_name = vss_full_name.get(database, record.name, record.physical)
+		# The item name in the record must agree with the revision class
+		assert(self.full_name.is_project == self.PROJECT_REVISION)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileRevisions):
@@ -115,15 +131,18 @@ class vss_named_revision(vss_revision):
 		return
 
 class vss_create_revision(vss_named_revision):
-	...
+	__slots__ = ()
 
 class vss_create_project_revision(vss_create_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_create_file_revision(vss_create_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_add_revision(vss_named_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index = item_file.add_item(self.full_name)
@@ -131,11 +150,14 @@ class vss_add_revision(vss_named_revision):
 
 class vss_add_project_revision(vss_add_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_add_file_revision(vss_add_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_delete_revision(vss_named_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index = item_file.find_item(self.full_name)
@@ -144,11 +166,14 @@ class vss_delete_revision(vss_named_revision):
 
 class vss_delete_project_revision(vss_delete_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_delete_file_revision(vss_delete_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_recover_revision(vss_named_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index = item_file.find_item(self.full_name)
@@ -157,11 +182,14 @@ class vss_recover_revision(vss_named_revision):
 
 class vss_recover_project_revision(vss_recover_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_recover_file_revision(vss_recover_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_destroy_revision(vss_named_revision):
+	__slots__ = ('was_deleted',)
 
 	def __init__(self, record:vss_destroy_revision_record, database, item_file:vss_project_item_file):
 		super().__init__(record, database, item_file)
@@ -182,14 +210,18 @@ class vss_destroy_revision(vss_named_revision):
 
 class vss_destroy_project_revision(vss_destroy_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_destroy_file_revision(vss_destroy_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_rename_revision(vss_named_revision):
+	__slots__ = ('old_full_name', 'old_item_index')
+
 	def __init__(self, record:vss_rename_revision_record, database, item_file:vss_project_item_file):
 		super().__init__(record, database, item_file)
-		self.old_full_name = vss_full_name(database, record.old_name, record.physical)
+		self.old_full_name = vss_full_name.get(database, record.old_name, record.physical)
 		return
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
@@ -206,19 +238,23 @@ class vss_rename_revision(vss_named_revision):
 
 class vss_rename_project_revision(vss_rename_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_rename_file_revision(vss_rename_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_move_revision(vss_named_revision):
 	PROJECT_REVISION = True
+	__slots__ = ('project_path',)
 
 	def __init__(self, record:vss_move_revision_record, database, item_file:vss_project_item_file):
 		super().__init__(record, database, item_file)
-		self.project_path = record.decode(record.project_path)
+		self.project_path = database.decode_string(record.project_path)
 		return
 
 class vss_move_from_revision(vss_move_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index = item_file.add_item(self.full_name)
@@ -231,6 +267,7 @@ class vss_move_from_revision(vss_move_revision):
 		return
 
 class vss_move_to_revision(vss_move_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index, item = item_file.remove_item(self.full_name)
@@ -245,10 +282,11 @@ class vss_move_to_revision(vss_move_revision):
 
 class vss_share_revision(vss_named_revision):
 	PROJECT_REVISION = False
+	__slots__ = ('project_path', 'pinned_revision', 'unpinned_revision')
 
 	def __init__(self, record:vss_share_revision_record, database, item_file:vss_project_item_file):
 		super().__init__(record, database, item_file)
-		self.project_path = record.decode(record.project_path)
+		self.project_path = database.decode_string(record.project_path)
 		self.item_index = record.project_idx
 		self.pinned_revision = record.pinned_revision
 		self.unpinned_revision = record.unpinned_revision
@@ -275,11 +313,12 @@ class vss_share_revision(vss_named_revision):
 		return
 
 class vss_checkin_revision(vss_revision):
+	__slots__ = ('project_path', 'delta_record')
 
 	def __init__(self, record:vss_checkin_revision_record, database, item_file:vss_item_file):
 		super().__init__(record, database, item_file)
 
-		self.project_path = record.decode(record.project_path)
+		self.project_path = database.decode_string(record.project_path)
 		if record.prev_delta_offset > 0:
 			self.delta_record = item_file.get_record(record.prev_delta_offset, vss_delta_record)
 		else:
@@ -300,11 +339,12 @@ class vss_checkin_revision(vss_revision):
 
 class vss_branch_revision(vss_named_revision):
 	PROJECT_REVISION = False
+	__slots__ = ('source_full_name',)
 
 	def __init__(self, record:vss_branch_revision_record, database, item_file:vss_item_file):
 		super().__init__(record, database, item_file)
 
-		self.source_full_name = vss_full_name(database, record.name, record.branch_file)
+		self.source_full_name = vss_full_name.get(database, record.name, record.branch_file)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileRevisions):
@@ -314,9 +354,10 @@ class vss_branch_revision(vss_named_revision):
 		return
 
 class vss_create_branch_revision(vss_branch_revision):
-	...
+	__slots__ = ()
 
 class vss_branch_file_revision(vss_branch_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index = item_file.find_item(self.source_full_name)
@@ -326,10 +367,11 @@ class vss_branch_file_revision(vss_branch_revision):
 		return
 
 class vss_archive_restore_revision(vss_named_revision):
+	__slots__ = ('archive_path',)
 
 	def __init__(self, record:vss_revision_record, database, item_file:vss_project_item_file):
 		super().__init__(record, database, item_file)
-		self.archive_path = record.decode(record.archive_path)
+		self.archive_path = database.decode_string(record.archive_path)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.FileRevisions):
@@ -339,15 +381,18 @@ class vss_archive_restore_revision(vss_named_revision):
 		return
 
 class vss_archive_revision(vss_archive_restore_revision):
-	...
+	__slots__ = ()
 
 class vss_archive_file_revision(vss_archive_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_archive_project_revision(vss_archive_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 class vss_restore_revision(vss_archive_restore_revision):
+	__slots__ = ()
 
 	def apply_to_project_items(self, item_file:vss_project_item_file):
 		self.item_index = item_file.add_item(self.full_name)
@@ -355,9 +400,11 @@ class vss_restore_revision(vss_archive_restore_revision):
 
 class vss_restore_file_revision(vss_restore_revision):
 	PROJECT_REVISION = False
+	__slots__ = ()
 
 class vss_restore_project_revision(vss_restore_revision):
 	PROJECT_REVISION = True
+	__slots__ = ()
 
 file_revision_class_dict = {
 	int(VssRevisionAction.Label) : vss_label_revision,
@@ -367,8 +414,12 @@ file_revision_class_dict = {
 	int(VssRevisionAction.ArchiveFile) : vss_archive_file_revision,
 }
 
+# record.action is a plain unsigned int, as unpacked from the record
+file_revision_class_table = make_action_table(file_revision_class_dict)
+
 def vss_file_revision_factory(record:vss_revision_record, database, item_file:vss_file_item_file)->vss_revision:
-	revision_class = file_revision_class_dict.get(int(record.action), None)
+	action = record.action
+	revision_class = file_revision_class_table[action] if action < len(file_revision_class_table) else None
 	if revision_class is None:
 		raise UnrecognizedRevActionException("Unrecognized file revision action", str(record.action))
 	return revision_class(record, database, item_file)
@@ -396,8 +447,11 @@ project_revision_class_dict = {
 	int(VssRevisionAction.RecoverFile) : vss_recover_file_revision,
 }
 
+project_revision_class_table = make_action_table(project_revision_class_dict)
+
 def vss_project_revision_factory(record:vss_revision_record, database, item_file:vss_project_item_file)->vss_revision:
-	revision_class = project_revision_class_dict.get(int(record.action), None)
+	action = record.action
+	revision_class = project_revision_class_table[action] if action < len(project_revision_class_table) else None
 	if revision_class is None:
 		raise UnrecognizedRevActionException("Unrecognized project revision action", str(record.action))
 	return revision_class(record, database, item_file)
@@ -50,13 +50,27 @@ class VssRevisionAction(IntEnum):
 	RestoreProject     = 25
 
 	def __str__(self):
-		# Don't want the class name
-		return super().__str__().removeprefix('VssRevisionAction.')
+		# Don't want the class name. Since Python 3.11, IntEnum.__str__ returns the number instead
+		return self.name
+
+### Make a tuple indexed by the revision action, from a dictionary keyed by the action.
+# Missing actions are None. Indexing a tuple is faster than a dictionary lookup.
+def make_action_table(class_dict:dict)->tuple:
+	table = [None] * (max(VssRevisionAction) + 1)
+	for action, value in class_dict.items():
+		table[action] = value
+		continue
+	return tuple(table)
+
+# Action names for printing, without constructing VssRevisionAction objects
+action_names = make_action_table({action : action.name for action in VssRevisionAction})
 
 class vss_revision_record(vss_record):
 
 	SIGNATURE = b"EL"
 	unpack_format = struct.Struct(b'<IHHI32s32sIIHH')
+	__slots__ = ('prev_rev_offset', 'action', 'revision_num', 'timestamp', 'user', 'label',
+			'comment_offset', 'label_comment_offset', 'comment_length', 'label_comment_length')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -97,10 +111,12 @@ class vss_revision_record(vss_record):
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
 		super().print(fd, indent, verbose)
 
-		print("%sRevision: %d" % (indent, self.revision_num), file=fd)
-		print("%sBy: '%s', at: %s (%d)" % (indent, self.decode(self.user), timestamp_to_datetime(self.timestamp), self.timestamp), file=fd)
-		print("%s%s (%d)" % (indent, VssRevisionAction(self.action), self.action), file=fd)
-		print("%sPrev rev offset: %06X" % (indent, self.prev_rev_offset), file=fd)
+		# One print call for the fixed lines
+		print("%sRevision: %d\n%sBy: '%s', at: %s (%d)\n%s%s (%d)\n%sPrev rev offset: %06X" % (
+				indent, self.revision_num,
+				indent, self.decode(self.user), timestamp_to_datetime(self.timestamp), self.timestamp,
+				indent, action_names[self.action], self.action,
+				indent, self.prev_rev_offset), file=fd)
 
 		if self.comment_offset != 0:
 			print("%sComment offset: %06X, length: %04X" %
@@ -112,6 +128,8 @@ class vss_revision_record(vss_record):
 
 class vss_label_revision_record(vss_revision_record):
 
+	__slots__ = ()
+
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.Records):
 		super().print(fd, indent, verbose)
 
@@ -119,6 +137,9 @@ class vss_label_revision_record(vss_revision_record):
 		return
 
 class vss_common_revision_record(vss_revision_record):
+	# name (vss_name), physical
+	vss_common_unpack_struct = struct.Struct(b'<H34sI10s')
+	__slots__ = ('name', 'physical')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -129,9 +150,14 @@ class vss_common_revision_record(vss_revision_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
-		self.name = self.reader.read_name()
-		self.physical = self.reader.read_byte_string(10)
+		(
+			name_flags, short_name, name_offset,
+			physical,
+		) = reader.unpack(self.vss_common_unpack_struct)
+		self.name = reader.make_name(name_flags, short_name, name_offset)
+		self.physical = zero_terminated(physical)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -141,6 +167,9 @@ class vss_common_revision_record(vss_revision_record):
 		return
 
 class vss_destroy_revision_record(vss_revision_record):
+	# name (vss_name), was_deleted, physical
+	vss_destroy_unpack_struct = struct.Struct(b'<H34sIH10s')
+	__slots__ = ('name', 'was_deleted', 'physical')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -152,12 +181,17 @@ class vss_destroy_revision_record(vss_revision_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
-		self.name = self.reader.read_name()
-		# 'was_deleted' is non-zero if the item was previously deleted, and now purged
-		# It is zero if the item has been destroyed without having been deleted
-		self.was_deleted = self.reader.read_uint16()
-		self.physical = self.reader.read_byte_string(10)
+		(
+			name_flags, short_name, name_offset,
+			# 'was_deleted' is non-zero if the item was previously deleted, and now purged
+			# It is zero if the item has been destroyed without having been deleted
+			self.was_deleted,
+			physical,
+		) = reader.unpack(self.vss_destroy_unpack_struct)
+		self.name = reader.make_name(name_flags, short_name, name_offset)
+		self.physical = zero_terminated(physical)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -169,6 +203,9 @@ class vss_destroy_revision_record(vss_revision_record):
 		return
 
 class vss_rename_revision_record(vss_revision_record):
+	# name (vss_name), old_name (vss_name), physical
+	vss_rename_unpack_struct = struct.Struct(b'<H34sIH34sI10s')
+	__slots__ = ('name', 'old_name', 'physical')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -180,10 +217,16 @@ class vss_rename_revision_record(vss_revision_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
-		self.name = self.reader.read_name()
-		self.old_name = self.reader.read_name()
-		self.physical = self.reader.read_byte_string(10)
+		(
+			name_flags, short_name, name_offset,
+			old_name_flags, old_short_name, old_name_offset,
+			physical,
+		) = reader.unpack(self.vss_rename_unpack_struct)
+		self.name = reader.make_name(name_flags, short_name, name_offset)
+		self.old_name = reader.make_name(old_name_flags, old_short_name, old_name_offset)
+		self.physical = zero_terminated(physical)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -194,6 +237,9 @@ class vss_rename_revision_record(vss_revision_record):
 		return
 
 class vss_move_revision_record(vss_revision_record):
+	# project_path, name (vss_name), physical
+	vss_move_unpack_struct = struct.Struct(b'<260sH34sI10s')
+	__slots__ = ('project_path', 'name', 'physical')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -205,10 +251,16 @@ class vss_move_revision_record(vss_revision_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
-		self.project_path = self.reader.read_byte_string(260)
-		self.name = self.reader.read_name()
-		self.physical = self.reader.read_byte_string(10)
+		(
+			project_path,
+			name_flags, short_name, name_offset,
+			physical,
+		) = reader.unpack(self.vss_move_unpack_struct)
+		self.project_path = zero_terminated(project_path)
+		self.name = reader.make_name(name_flags, short_name, name_offset)
+		self.physical = zero_terminated(physical)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -219,7 +271,9 @@ class vss_move_revision_record(vss_revision_record):
 		return
 
 class vss_share_revision_record(vss_revision_record):
-	vss_share_unpack_struct = struct.Struct(b'<hhh')
+	# project_path, name (vss_name), unpinned_revision, pinned_revision, project_idx, physical
+	vss_share_unpack_struct = struct.Struct(b'<260sH34sIhhh10s')
+	__slots__ = ('project_path', 'name', 'unpinned_revision', 'pinned_revision', 'project_idx', 'physical')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -236,15 +290,18 @@ class vss_share_revision_record(vss_revision_record):
 		super().read()
 		reader = self.reader
 
-		self.project_path = reader.read_byte_string(260)
-		self.name = reader.read_name()
 		(
+			project_path,
+			name_flags, short_name, name_offset,
 			self.unpinned_revision,
 			self.pinned_revision,
 			# Index in the project items file:
 			self.project_idx,
+			physical,
 		) = reader.unpack(self.vss_share_unpack_struct)
-		self.physical = reader.read_byte_string(10)
+		self.project_path = zero_terminated(project_path)
+		self.name = reader.make_name(name_flags, short_name, name_offset)
+		self.physical = zero_terminated(physical)
 		return
 
 	def print(self, fd, indent:str='', verbose:VerboseFlags=VerboseFlags.RecordHeaders):
@@ -261,6 +318,8 @@ class vss_share_revision_record(vss_revision_record):
 
 class vss_branch_revision_record(vss_common_revision_record):
 
+	__slots__ = ('branch_file',)
+
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
 
@@ -280,7 +339,9 @@ class vss_branch_revision_record(vss_common_revision_record):
 		return
 
 class vss_checkin_revision_record(vss_revision_record):
-	vss_checkin_unpack_struct = struct.Struct(b'<II')
+	# prev_delta_offset, filler, project_path
+	vss_checkin_unpack_struct = struct.Struct(b'<II260s')
+	__slots__ = ('project_path', 'prev_delta_offset', 'filler')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -291,12 +352,14 @@ class vss_checkin_revision_record(vss_revision_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
 		(
 			self.prev_delta_offset,
 			self.filler,
-		) = self.reader.unpack(self.vss_checkin_unpack_struct)
-		self.project_path = self.reader.read_byte_string(260)
+			project_path,
+		) = reader.unpack(self.vss_checkin_unpack_struct)
+		self.project_path = zero_terminated(project_path)
 
 		return
 
@@ -310,6 +373,9 @@ class vss_checkin_revision_record(vss_revision_record):
 		return
 
 class vss_archive_restore_revision_record(vss_common_revision_record):
+	# filler16, archive_path, filler32
+	vss_archive_unpack_struct = struct.Struct(b'<H260sI')
+	__slots__ = ('filler16', 'archive_path', 'filler32')
 
 	def __init__(self, header:vss_record_header):
 		super().__init__(header)
@@ -319,10 +385,14 @@ class vss_archive_restore_revision_record(vss_common_revision_record):
 
 	def read(self):
 		super().read()
+		reader = self.reader
 
-		self.filler16 = self.reader.read_uint16()
-		self.archive_path = self.reader.read_byte_string(260)
-		self.filler32 = self.reader.read_uint32()
+		(
+			self.filler16,
+			archive_path,
+			self.filler32,
+		) = reader.unpack(self.vss_archive_unpack_struct)
+		self.archive_path = zero_terminated(archive_path)
 		# NOTE: Two more words in the record may be meaningful
 		return
 
@@ -362,18 +432,27 @@ class vss_revision_record_factory:
 		int(VssRevisionAction.RecoverProject) : vss_common_revision_record,
 		int(VssRevisionAction.RecoverFile) : vss_common_revision_record,
 	}
+	# Actions are small dense integers: index a tuple instead of hashing into the dictionary
+	class_table = make_action_table(class_dict)
+	# Bound create_record methods, to skip the attribute lookup on each record
+	create_table = make_action_table({action : record_class.create_record
+						for action, record_class in class_dict.items()})
 
 	@classmethod
 	def create_record(cls, record_header)->vss_revision_record:
 		action = record_header.reader.read_int16_at(4)
-		record_class = cls.class_dict.get(action, None)
-		if record_class is not None:
-			return record_class.create_record(record_header)
+		create_table = cls.create_table
+		# The action is read as signed; negative values are not valid indices
+		if 0 <= action < len(create_table):
+			create_record = create_table[action]
+			if create_record is not None:
+				return create_record(record_header)
 		raise UnrecognizedRevActionException("Unrecognized revision action", str(action))
 
 	@classmethod
 	def valid_record_class(cls, record):
-		record_class = cls.class_dict.get(record.action, None)
+		class_table = cls.class_table
+		record_class = class_table[record.action] if record.action < len(class_table) else None
 		return record_class is not None and \
 			record_class.valid_record_class(record)
 
@@ -12,9 +12,9 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from enum import IntFlag
-
-class VerboseFlags(IntFlag):
+# Plain int constants, not IntFlag: the flags are tested and combined in every print call,
+# and IntFlag operators construct a new enum member each time.
+class VerboseFlags:
 	VerboseNone			= 0x00000000
 	RecordHeaders		= 0x00000001	# For all records, print their headers
 	Records				= 0x00000002	# For all records, print their headers
@@ -18,11 +18,11 @@ import sys
 def main():
 
 	import argparse
-	from VSS.vss_database import vss_database
 
 	parser = argparse.ArgumentParser()
 	parser.add_argument("database")
-	parser.add_argument("--log", '-L', type=argparse.FileType('wt', encoding='utf-8'),
+	# The dump is written in many small pieces. A big buffer makes it fewer large writes
+	parser.add_argument("--log", '-L', type=argparse.FileType('wt', bufsize=0x100000, encoding='utf-8'),
 						help="Log file, default: standard output",
 						default=sys.stdout)
 	parser.add_argument("--encoding", '-E',
@@ -30,6 +30,10 @@ def main():
 						default='mbcs')
 	parser.add_argument("--root-project-file", '-P',
 				help='Dump from this project file, recursively')
+	parser.add_argument("--mmap", action='store_true',
+				help='Memory-map big database files instead of reading them')
+	parser.add_argument("--prefetch", action='store_true',
+				help='Prefetch the database files in background (where supported by the OS)')
 	parser.add_argument("--verbose", '-V', nargs='+', action='extend',
 					help="""Controls log output.
 Values: 'projects' - print project structure;
@@ -41,18 +45,29 @@ Values: 'projects' - print project structure;
 	options = parser.parse_args()
 	log_file = options.log
 
+	# Imported after the arguments are parsed, so that --help and usage errors don't load the whole package
+	from VSS.vss_database import vss_database
+
 	print("Loading database", options.database, file=sys.stderr)
 	database = vss_database(options.database,
 							encoding=options.encoding,
-							root_project_file=options.root_project_file)
+							root_project_file=options.root_project_file,
+							use_mmap=options.mmap)
+
+	if options.prefetch:
+		import threading
+		threading.Thread(target=database.prefetch_data_files, daemon=True).start()
+
+	verbose = frozenset(options.verbose or ('revisions',))
 
-	# Preload files
-	database.get_project_tree()
+	# Preload files, only for the options which print the project tree or the files.
+	# The changelist builder walks the project tree by itself
+	if verbose & {'tree', 'projects', 'records', 'hex', 'revisions', 'files'}:
+		database.get_project_tree()
 	print("Done", file=sys.stderr)
 
 	from VSS.vss_verbose import VerboseFlags
 	verbose_flags = VerboseFlags.Database
-	verbose = options.verbose or ['revisions']
 
 	if 'tree' in verbose:
 		database.print(log_file, verbose=verbose_flags | VerboseFlags.ProjectTree)
@@ -87,6 +102,7 @@ Values: 'projects' - print project structure;
 		changeset_history.print(log_file, verbose=verbose_flags | VerboseFlags.History)
 		print("Done", file=sys.stderr)
 
+	log_file.flush()
 	return 0
 
 if __name__ == "__main__":